@@ -0,0 +1,84 @@
+import hashlib
+import threading
+import uuid
+from contextlib import contextmanager
+from django.core.cache import cache, caches
+from django.db import transaction
+
+
+GENERATION_KEY = 'countries:generation'
+# Kept out of the default cache so culling there can never evict it
+GENERATION_CACHE = 'generation'
+
+_batch = threading.local()
+
+
+def get_generation():
+    """
+    Return the current data generation token, creating one if missing
+    """
+    generation_cache = caches[GENERATION_CACHE]
+    generation = generation_cache.get(GENERATION_KEY)
+    if generation is None:
+        # FileBasedCache.add() is has_key() then set(), so racing workers may
+        # each write a token; the loser's entries just become cache misses
+        generation_cache.add(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = generation_cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """
+    Replace the generation token so every cached read is dropped at once.
+    A fresh random token (instead of incr) keeps the bump a single atomic
+    write, which file-based backends cannot guarantee for counters.
+    """
+    caches[GENERATION_CACHE].set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_on_commit():
+    """
+    Bump the generation once the current transaction commits, so no worker
+    can cache data read before the change became visible. Inside
+    batch_invalidation() the bump is deferred to the end of the batch.
+    """
+    if getattr(_batch, 'active', False):
+        _batch.dirty = True
+        return
+    transaction.on_commit(bump_generation)
+
+
+@contextmanager
+def batch_invalidation():
+    """
+    Collapse the bumps from every write inside the block into one
+    """
+    if getattr(_batch, 'active', False):
+        yield
+        return
+    _batch.active, _batch.dirty = True, False
+    try:
+        yield
+    finally:
+        _batch.active = False
+        if _batch.dirty:
+            invalidate_on_commit()
+
+
+def make_key(*parts):
+    """
+    Build a cache key namespaced by the current data generation
+    """
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f"countries:{get_generation()}:{digest}"
+
+
+def get_or_compute(key, compute):
+    """
+    Return the cached value for key, computing and storing it on a miss
+    """
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value)
+    return value
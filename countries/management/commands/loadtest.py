@@ -0,0 +1,467 @@
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from countries.services import CountryService
+
+
+ENDPOINTS = ['list', 'detail', 'status', 'image', 'delete', 'refresh']
+DEFAULT_MIX = 'list=45,detail=25,status=15,image=8,delete=5,refresh=2'
+REGIONS = ['Africa', 'Americas', 'Asia', 'Europe', 'Oceania']
+CURRENCIES = ['NGN', 'GHS', 'KES', 'USD', 'EUR', 'GBP', 'JPY', 'INR']
+
+
+def classify(method, path):
+    """
+    Map a request method and path to a harness endpoint name
+    """
+    path = path.rstrip('/')
+    if path == '/status':
+        return 'status'
+    if path == '/countries/refresh':
+        return 'refresh'
+    if path == '/countries/image':
+        return 'image'
+    if path == '/countries':
+        return 'list'
+    if path.startswith('/countries/'):
+        return 'delete' if method == 'DELETE' else 'detail'
+    return 'other'
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def latency_summary(values):
+    """
+    Summarise a list of durations in seconds as milliseconds
+    """
+    values = sorted(values)
+    summary = {'count': len(values)}
+    for pct in (50, 95, 99):
+        value = percentile(values, pct)
+        summary[f'p{pct}_ms'] = round(value * 1000, 3) if value is not None else None
+    summary['max_ms'] = round(values[-1] * 1000, 3) if values else None
+    return summary
+
+
+def parse_mix(mix):
+    """
+    Parse "list=45,detail=25,..." into an endpoint -> weight dict
+    """
+    weights = {}
+    for part in mix.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise CommandError(f"Unknown endpoint '{name}' in --mix (choose from {', '.join(ENDPOINTS)})")
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight for '{name}' in --mix")
+    if not weights or sum(weights.values()) <= 0:
+        raise CommandError('--mix must give at least one endpoint a positive weight')
+    return weights
+
+
+def stub_countries(total):
+    """
+    Deterministic payloads for the stub upstream APIs
+    """
+    countries = []
+    for idx in range(total):
+        countries.append({
+            'name': f'Country {idx:03d}',
+            'capital': f'Capital {idx:03d}',
+            'region': REGIONS[idx % len(REGIONS)],
+            'population': 100000 + idx * 750000,
+            'flag': f'https://flags.example/{idx:03d}.svg',
+            'currencies': [{'code': CURRENCIES[idx % len(CURRENCIES)]}],
+        })
+    rates = {code: 1 + idx * 150.5 for idx, code in enumerate(CURRENCIES)}
+    return countries, {'result': 'success', 'rates': rates}
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """
+    Serves the countries and exchange rate payloads with an optional delay
+    """
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        payload = self.server.countries if self.path.startswith('/countries') else self.server.rates
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class DatabaseProbe:
+    """
+    WSGI wrapper that times every SQL statement per endpoint.
+    SQLite waits on its busy timeout inside the statement, so statements
+    slower than the threshold are counted as lock waits. Statements that
+    fail with "database is locked" are counted separately as lock errors,
+    since SQLite often raises those at once without waiting.
+    """
+    def __init__(self, app, threshold):
+        self.app = app
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.stats = defaultdict(lambda: {
+            'statements': 0,
+            'db_time': 0.0,
+            'lock_waits': [],
+            'lock_errors': 0,
+        })
+
+    def __call__(self, environ, start_response):
+        endpoint = classify(environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', ''))
+
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            locked = False
+            try:
+                return execute(sql, params, many, context)
+            except OperationalError as e:
+                locked = 'database is locked' in str(e)
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    stats = self.stats[endpoint]
+                    stats['statements'] += 1
+                    stats['db_time'] += elapsed
+                    if locked:
+                        stats['lock_errors'] += 1
+                    if elapsed >= self.threshold:
+                        stats['lock_waits'].append(elapsed)
+
+        with connection.execute_wrapper(wrapper):
+            return self.app(environ, start_response)
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive a concurrent mix of list, detail, status, image, delete and refresh '
+        'requests against the app on a throwaway SQLite database with a stub '
+        'upstream, then report per-endpoint latency, throughput, errors and lock waits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run the load (default 30)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads (default 8)')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Endpoint weights (default "{DEFAULT_MIX}")')
+        parser.add_argument('--countries', type=int, default=250, help='Countries served by the stub upstream')
+        parser.add_argument('--upstream-delay', type=float, default=0.0, help='Stub upstream latency in seconds')
+        parser.add_argument('--lock-threshold-ms', type=float, default=50.0,
+                            help='SQL statements slower than this count as lock waits (default 50)')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the read cache (DummyCache)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the request mix')
+        parser.add_argument('--output', help='Write the JSON results to this file')
+        parser.add_argument('--compare', help='JSON results of a previous run to compare against')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('loadtest targets the SQLite backend')
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency and --duration must be positive')
+        weights = parse_mix(options['mix'])
+
+        # settings_dict is settings.DATABASES['default'] itself, so the
+        # throwaway name set in run_load must be put back for in-process
+        # callers, along with their (possibly open) connection
+        original_connection = connections['default']
+        database = original_connection.settings_dict
+        original_name = database['NAME']
+        workdir = tempfile.mkdtemp(prefix='countries-loadtest-')
+        try:
+            results = self.run_load(workdir, weights, options)
+        finally:
+            if connections['default'] is not original_connection:
+                connections['default'].close()
+            database['NAME'] = original_name
+            connections['default'] = original_connection
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.print_report(results)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options['compare']:
+            with open(options['compare']) as fh:
+                self.print_comparison(json.load(fh), results)
+
+    def run_load(self, workdir, weights, options):
+        # Point the app at a throwaway database, cache and image directory so
+        # the dev database and cache/summary.png are never touched. This
+        # thread gets a fresh connection; server threads open their own.
+        connections['default'].settings_dict['NAME'] = os.path.join(workdir, 'loadtest.sqlite3')
+        connections['default'] = connections.create_connection('default')
+        os.makedirs(os.path.join(workdir, 'cache'), exist_ok=True)
+        if options['no_cache']:
+            caches = {
+                alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+                for alias in settings.CACHES
+            }
+        else:
+            caches = {
+                alias: dict(config, LOCATION=os.path.join(workdir, 'cache', f'django-{alias}'))
+                for alias, config in settings.CACHES.items()
+            }
+
+        call_command('migrate', run_syncdb=True, verbosity=0)
+        request_logger = logging.getLogger('django.request')
+        original_log_level = request_logger.level
+
+        countries, rates = stub_countries(options['countries'])
+        upstream = ThreadingHTTPServer(('127.0.0.1', 0), StubUpstreamHandler)
+        upstream.daemon_threads = True
+        upstream.countries, upstream.rates, upstream.delay = countries, rates, options['upstream_delay']
+        upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}'
+
+        probe = DatabaseProbe(get_wsgi_application(), options['lock_threshold_ms'] / 1000.0)
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler, allow_reuse_address=False)
+        server.set_app(probe)
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        original_apis = (CountryService.COUNTRIES_API, CountryService.EXCHANGE_RATE_API)
+        CountryService.COUNTRIES_API = f'{upstream_url}/countries'
+        CountryService.EXCHANGE_RATE_API = f'{upstream_url}/rates'
+        threads = [
+            threading.Thread(target=upstream.serve_forever, daemon=True),
+            threading.Thread(target=server.serve_forever, daemon=True),
+        ]
+        try:
+            request_logger.setLevel(logging.CRITICAL)
+            with override_settings(DEBUG=False, BASE_DIR=Path(workdir), CACHES=caches):
+                for thread in threads:
+                    thread.start()
+                # Seed the database before measuring
+                response = requests.post(f'{base_url}/countries/refresh/', timeout=120)
+                if response.status_code != 200:
+                    raise CommandError(f'Initial refresh failed: {response.status_code} {response.text[:200]}')
+                probe.stats.clear()
+
+                samples, elapsed = self.drive(base_url, [c['name'] for c in countries], weights, options)
+        finally:
+            server.shutdown()
+            upstream.shutdown()
+            server.server_close()
+            upstream.server_close()
+            CountryService.COUNTRIES_API, CountryService.EXCHANGE_RATE_API = original_apis
+            request_logger.setLevel(original_log_level)
+
+        return self.summarise(samples, probe.stats, elapsed, options)
+
+    def drive(self, base_url, names, weights, options):
+        """
+        Run the client threads and collect (endpoint, latency, status) samples
+        """
+        endpoints = list(weights)
+        endpoint_weights = [weights[name] for name in endpoints]
+        samples = []
+        samples_lock = threading.Lock()
+        master = random.Random(options['seed'])
+        deadline = time.perf_counter() + options['duration']
+
+        def client(rng):
+            session = requests.Session()
+            local = []
+            while time.perf_counter() < deadline:
+                endpoint = rng.choices(endpoints, endpoint_weights)[0]
+                method, url = self.build_request(endpoint, base_url, names, rng)
+                start = time.perf_counter()
+                try:
+                    response = session.request(method, url, timeout=120)
+                    local.append((endpoint, time.perf_counter() - start, response.status_code))
+                except requests.RequestException:
+                    local.append((endpoint, time.perf_counter() - start, None))
+            with samples_lock:
+                samples.extend(local)
+
+        started = time.perf_counter()
+        workers = [
+            threading.Thread(target=client, args=(random.Random(master.random()),))
+            for _ in range(options['concurrency'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return samples, time.perf_counter() - started
+
+    @staticmethod
+    def build_request(endpoint, base_url, names, rng):
+        if endpoint == 'list':
+            query = rng.choice([
+                '',
+                f'?region={rng.choice(REGIONS)}',
+                f'?region={rng.choice(REGIONS)}&sort=gdp_desc',
+                f'?currency={rng.choice(CURRENCIES)}',
+                '?population_min=10000000&sort=population_desc',
+            ])
+            return 'GET', f'{base_url}/countries/{query}'
+        if endpoint == 'detail':
+            return 'GET', f'{base_url}/countries/{rng.choice(names)}/'
+        if endpoint == 'delete':
+            return 'DELETE', f'{base_url}/countries/{rng.choice(names)}/'
+        if endpoint == 'status':
+            return 'GET', f'{base_url}/status/'
+        if endpoint == 'image':
+            return 'GET', f'{base_url}/countries/image/'
+        return 'POST', f'{base_url}/countries/refresh/'
+
+    @staticmethod
+    def summarise(samples, db_stats, elapsed, options):
+        by_endpoint = defaultdict(list)
+        for sample in samples:
+            by_endpoint[sample[0]].append(sample)
+
+        endpoints = {}
+        for name in ENDPOINTS:
+            rows = by_endpoint.get(name, [])
+            if not rows and name not in db_stats:
+                continue
+            status_counts = defaultdict(int)
+            for _, _, status_code in rows:
+                status_counts[str(status_code) if status_code else 'connection_error'] += 1
+            errors = sum(1 for _, _, status_code in rows if status_code is None or status_code >= 500)
+            db = db_stats.get(name, {'statements': 0, 'db_time': 0.0, 'lock_waits': [], 'lock_errors': 0})
+            endpoints[name] = {
+                'requests': len(rows),
+                'throughput_rps': round(len(rows) / elapsed, 3),
+                'latency': latency_summary([latency for _, latency, _ in rows]),
+                'status_codes': dict(status_counts),
+                'errors': errors,
+                'error_rate': round(errors / len(rows), 4) if rows else 0.0,
+                # Counted server-side: with DEBUG off most 500 bodies hide the cause
+                'database_locked': db['lock_errors'],
+                'db': {
+                    'statements': db['statements'],
+                    'time_ms': round(db['db_time'] * 1000, 3),
+                    'lock_errors': db['lock_errors'],
+                    'lock_waits': len(db['lock_waits']),
+                    'lock_wait_total_ms': round(sum(db['lock_waits']) * 1000, 3),
+                    'lock_wait': latency_summary(db['lock_waits']),
+                },
+            }
+
+        total = len(samples)
+        total_errors = sum(endpoint['errors'] for endpoint in endpoints.values())
+        return {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'git_commit': git_commit(),
+                'duration_s': round(elapsed, 3),
+                'concurrency': options['concurrency'],
+                'mix': options['mix'],
+                'countries': options['countries'],
+                'upstream_delay_s': options['upstream_delay'],
+                'lock_threshold_ms': options['lock_threshold_ms'],
+                'cache': 'disabled' if options['no_cache'] else settings.CACHES['default']['BACKEND'],
+                'seed': options['seed'],
+            },
+            'totals': {
+                'requests': total,
+                'throughput_rps': round(total / elapsed, 3),
+                'errors': total_errors,
+                'error_rate': round(total_errors / total, 4) if total else 0.0,
+                'latency': latency_summary([sample[1] for sample in samples]),
+            },
+            'endpoints': endpoints,
+        }
+
+    def print_report(self, results):
+        meta, totals = results['meta'], results['totals']
+        self.stdout.write(
+            f"\n{totals['requests']} requests in {meta['duration_s']}s "
+            f"({totals['throughput_rps']} req/s), concurrency {meta['concurrency']}, "
+            f"error rate {totals['error_rate']:.2%}"
+        )
+        header = f"{'endpoint':<9}{'reqs':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}" \
+                 f"{'err %':>8}{'locked':>8}{'waits':>7}{'wait ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, data in results['endpoints'].items():
+            latency = data['latency']
+            self.stdout.write(
+                f"{name:<9}{data['requests']:>7}{data['throughput_rps']:>9.1f}"
+                f"{fmt(latency['p50_ms']):>10}{fmt(latency['p95_ms']):>10}{fmt(latency['p99_ms']):>10}"
+                f"{data['error_rate'] * 100:>8.2f}{data['database_locked']:>8}"
+                f"{data['db']['lock_waits']:>7}{data['db']['lock_wait_total_ms']:>10.1f}"
+            )
+
+    def print_comparison(self, baseline, results):
+        self.stdout.write(f"\nCompared with {baseline['meta'].get('git_commit') or 'baseline'}:")
+        for name, data in results['endpoints'].items():
+            before = baseline.get('endpoints', {}).get(name)
+            if not before:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                changes.append(f"{key[:-3]} {delta(before['latency'][key], data['latency'][key])}")
+            changes.append(f"rps {delta(before['throughput_rps'], data['throughput_rps'])}")
+            changes.append(f"err {before['error_rate']:.2%} -> {data['error_rate']:.2%}")
+            self.stdout.write(f"  {name:<9}" + ', '.join(changes))
+
+
+def fmt(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+def delta(before, after):
+    if before is None or after is None:
+        return 'n/a'
+    if before == 0:
+        return f'{before} -> {after}'
+    return f'{(after - before) / before:+.1%}'
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Country',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=255, unique=True)),
+                ('capital', models.CharField(blank=True, max_length=255, null=True)),
+                ('region', models.CharField(blank=True, db_index=True, max_length=100, null=True)),
+                ('population', models.BigIntegerField()),
+                ('currency_code', models.CharField(blank=True, db_index=True, max_length=10, null=True)),
+                ('exchange_rate', models.DecimalField(blank=True, decimal_places=4, max_digits=15, null=True)),
+                ('estimated_gdp', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('flag_url', models.URLField(blank=True, null=True)),
+                ('last_refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'Countries',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RefreshStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('total_countries', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Refresh Status',
+            },
+        ),
+    ]
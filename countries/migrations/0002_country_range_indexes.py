@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:39
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('countries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(django.db.models.functions.text.Lower('region'), models.F('estimated_gdp'), name='country_region_gdp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(django.db.models.functions.text.Lower('region'), models.F('population'), name='country_region_pop_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(fields=['estimated_gdp'], name='country_gdp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(fields=['population'], name='country_pop_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
@@ -16,6 +17,14 @@ class Country(models.Model):
     class Meta:
         verbose_name_plural = "Countries"
         ordering = ['name']
+        # Region is matched case-insensitively, so the composite indexes are
+        # keyed on LOWER(region) to let filtered + sorted lists use range scans
+        indexes = [
+            models.Index(Lower('region'), 'estimated_gdp', name='country_region_gdp_idx'),
+            models.Index(Lower('region'), 'population', name='country_region_pop_idx'),
+            models.Index(fields=['estimated_gdp'], name='country_gdp_idx'),
+            models.Index(fields=['population'], name='country_pop_idx'),
+        ]
 
     def __str__(self):
         return self.name
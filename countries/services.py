@@ -4,6 +4,7 @@ from decimal import Decimal
 from django.utils import timezone
 from django.db import transaction
 from .models import Country, RefreshStatus
+from .caching import batch_invalidation
 from PIL import Image, ImageDraw, ImageFont
 import os
 from django.conf import settings
@@ -68,6 +69,7 @@ class CountryService:
 
     @staticmethod
     @transaction.atomic
+    @batch_invalidation()
     def refresh_countries():
         """
         Main method to fetch, process and store country data
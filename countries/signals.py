@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .caching import invalidate_on_commit
+from .models import Country, RefreshStatus
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=RefreshStatus)
+@receiver(post_delete, sender=RefreshStatus)
+def invalidate_cached_reads(sender, **kwargs):
+    """
+    Drop cached reads on every write path (views, refresh, admin)
+    """
+    invalidate_on_commit()
@@ -1,3 +1,225 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.request import Request
+from .models import Country, RefreshStatus
+from .services import CountryService
+from .caching import batch_invalidation, get_generation
+from .views import CountryListView
+from .management.commands.loadtest import classify, parse_mix, percentile
 
-# Create your tests here.
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'generation': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'generation',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReadCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.create(name='Nigeria', region='Africa', population=200000000, currency_code='NGN')
+            Country.objects.create(name='Ghana', region='Africa', population=31000000, currency_code='GHS')
+            RefreshStatus.objects.create(total_countries=2)
+
+    def test_status_served_from_cache(self):
+        self.client.get('/status/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/status/')
+        self.assertEqual(response.json()['total_countries'], 2)
+
+    def test_list_cached_per_query(self):
+        self.client.get('/countries/?region=Africa')
+        with self.assertNumQueries(0):
+            self.client.get('/countries/?region=Africa')
+        with self.assertNumQueries(1):
+            self.client.get('/countries/?currency=NGN')
+
+    def test_delete_invalidates_reads(self):
+        self.assertEqual(len(self.client.get('/countries/').json()), 2)
+        self.client.get('/countries/Ghana/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete('/countries/Ghana/')
+        self.assertEqual(len(self.client.get('/countries/').json()), 1)
+        self.assertEqual(self.client.get('/countries/Ghana/').status_code, 404)
+        self.assertEqual(self.client.get('/status/').json()['total_countries'], 1)
+
+    def test_model_save_invalidates_reads(self):
+        self.client.get('/countries/Ghana/')
+        self.client.get('/countries/')
+        ghana = Country.objects.get(name='Ghana')
+        ghana.capital = 'Accra'
+        with self.captureOnCommitCallbacks(execute=True):
+            ghana.save()
+        self.assertEqual(self.client.get('/countries/Ghana/').json()['capital'], 'Accra')
+        capitals = {country['name']: country['capital'] for country in self.client.get('/countries/').json()}
+        self.assertEqual(capitals['Ghana'], 'Accra')
+
+    def test_detail_cache_matches_database_case_folding(self):
+        Country.objects.create(name="Côte d'Ivoire", region='Africa', population=26000000)
+        uncached = self.client.get("/countries/CÔTE D'IVOIRE/").status_code
+        self.assertEqual(self.client.get("/countries/Côte d'Ivoire/").status_code, 200)
+        self.assertEqual(self.client.get("/countries/CÔTE D'IVOIRE/").status_code, uncached)
+
+    def test_clearing_default_cache_keeps_generation(self):
+        generation = get_generation()
+        cache.clear()
+        self.assertEqual(get_generation(), generation)
+
+    def test_batch_schedules_one_bump(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic(), batch_invalidation():
+                Country.objects.create(name='Togo', region='Africa', population=8000000)
+                Country.objects.filter(name='Ghana').delete()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_bump_after_rolled_back_batch(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic(), batch_invalidation():
+                Country.objects.create(name='Togo', region='Africa', population=8000000)
+                raise ValueError
+        self.client.get('/countries/Ghana/')
+        ghana = Country.objects.get(name='Ghana')
+        ghana.capital = 'Accra'
+        with self.captureOnCommitCallbacks(execute=True):
+            ghana.save()
+        self.assertEqual(self.client.get('/countries/Ghana/').json()['capital'], 'Accra')
+
+    @mock.patch.object(CountryService, 'generate_summary_image')
+    @mock.patch.object(CountryService, 'fetch_exchange_rates', return_value={'NGN': 1500})
+    @mock.patch.object(CountryService, 'fetch_countries', return_value=[
+        {'name': 'Kenya', 'region': 'Africa', 'population': 53000000, 'currencies': [{'code': 'KES'}]},
+    ])
+    def test_refresh_invalidates_reads(self, *mocks):
+        self.assertEqual(self.client.get('/status/').json()['total_countries'], 2)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            CountryService.refresh_countries()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.client.get('/status/').json()['total_countries'], 3)
+        self.assertEqual(self.client.get('/countries/Kenya/').status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RangeFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Country.objects.create(name='Nigeria', region='Africa', population=200000000, estimated_gdp=900000)
+        Country.objects.create(name='Ghana', region='Africa', population=31000000, estimated_gdp=400000)
+        Country.objects.create(name='Togo', region='Africa', population=8000000, estimated_gdp=50000)
+        Country.objects.create(name='France', region='Europe', population=67000000, estimated_gdp=2000000)
+
+    def names(self, query):
+        response = self.client.get(f'/countries/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [country['name'] for country in response.json()]
+
+    def test_population_range_with_region_and_sort(self):
+        self.assertEqual(
+            self.names('region=africa&population_min=10000000&sort=population_desc'),
+            ['Nigeria', 'Ghana']
+        )
+
+    def test_gdp_range(self):
+        self.assertEqual(self.names('gdp_min=100000&gdp_max=1000000&sort=gdp_asc'), ['Ghana', 'Nigeria'])
+
+    def test_invalid_range_param(self):
+        response = self.client.get('/countries/?gdp_min=abc&population_max=NaN')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['details']), {'gdp_min', 'population_max'})
+
+    def test_fractional_population_param(self):
+        response = self.client.get('/countries/?population_min=1.5')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['details']['population_min'], 'must be an integer')
+
+
+class RangeFilterQueryPlanTests(TestCase):
+    def query_plan(self, query):
+        view = CountryListView()
+        view.request = Request(RequestFactory().get(f'/countries/?{query}'))
+        sql, params = view.get_queryset().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return ' '.join(row[-1] for row in cursor.fetchall())
+
+    def assertIndexRangeScan(self, query, index):
+        plan = self.query_plan(query)
+        self.assertIn(f'SEARCH countries_country USING INDEX {index}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_region_gdp_range_sorted_by_gdp(self):
+        self.assertIndexRangeScan('region=Africa&gdp_min=1000&sort=gdp_desc', 'country_region_gdp_idx')
+
+    def test_region_population_range_sorted_by_population(self):
+        self.assertIndexRangeScan(
+            'region=Africa&population_min=10000000&population_max=90000000&sort=population_asc',
+            'country_region_pop_idx'
+        )
+
+    def test_population_range_without_region(self):
+        self.assertIndexRangeScan('population_min=10000000&sort=population_desc', 'country_pop_idx')
+
+
+class LoadTestHelperTests(TestCase):
+    def test_classify(self):
+        self.assertEqual(classify('GET', '/countries/'), 'list')
+        self.assertEqual(classify('GET', '/countries/Ghana/'), 'detail')
+        self.assertEqual(classify('DELETE', '/countries/Ghana'), 'delete')
+        self.assertEqual(classify('POST', '/countries/refresh/'), 'refresh')
+        self.assertEqual(classify('GET', '/countries/image/'), 'image')
+        self.assertEqual(classify('GET', '/status/'), 'status')
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 95))
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('list=3, refresh=1'), {'list': 3.0, 'refresh': 1.0})
+        with self.assertRaises(CommandError):
+            parse_mix('list=1,upload=2')
+
+
+class LoadTestCommandTests(TestCase):
+    def test_smoke_run_restores_state(self):
+        Country.objects.create(name='Ghana', region='Africa', population=31000000)
+        original_connection = connections['default']
+        original_name = settings.DATABASES['default']['NAME']
+        original_level = logging.getLogger('django.request').level
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'results.json')
+            call_command(
+                'loadtest', duration=0.5, concurrency=2, countries=20,
+                seed=1, output=output, stdout=StringIO()
+            )
+            with open(output) as fh:
+                results = json.load(fh)
+
+        self.assertEqual(set(results), {'meta', 'totals', 'endpoints'})
+        self.assertGreater(results['totals']['requests'], 0)
+        for data in results['endpoints'].values():
+            self.assertIn('p99_ms', data['latency'])
+            self.assertIn('lock_errors', data['db'])
+        self.assertEqual(settings.DATABASES['default']['NAME'], original_name)
+        self.assertIs(connections['default'], original_connection)
+        self.assertEqual(logging.getLogger('django.request').level, original_level)
+        self.assertTrue(Country.objects.filter(name='Ghana').exists())
@@ -4,13 +4,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.http import FileResponse, Http404
 from django.db.models import Q
+from django.db.models.functions import Lower
+from rest_framework import serializers
+from decimal import Decimal, InvalidOperation
 from .models import Country, RefreshStatus
 from .serializers import CountrySerializer, StatusResponseSerializer
 from .services import CountryService
+from .caching import make_key, get_or_compute
 import os
 from django.conf import settings
 
 
+def parse_decimal(value):
+    """
+    Parse a finite Decimal, rejecting NaN and Infinity
+    """
+    number = Decimal(value)
+    if not number.is_finite():
+        raise ValueError(value)
+    return number
+
+
 class CountryRefreshView(APIView):
     """
     POST /countries/refresh
@@ -47,23 +61,54 @@ class CountryListView(ListAPIView):
     Supports:
     - ?region=Africa
     - ?currency=NGN
+    - ?population_min=10000000&population_max=50000000
+    - ?gdp_min=1000000&gdp_max=5000000
     - ?sort=gdp_desc (or gdp_asc, name_asc, name_desc, population_asc, population_desc)
     """
     serializer_class = CountrySerializer
 
+    # query param -> (field lookup, parser, error message)
+    RANGE_FILTERS = {
+        'population_min': ('population__gte', int, 'must be an integer'),
+        'population_max': ('population__lte', int, 'must be an integer'),
+        'gdp_min': ('estimated_gdp__gte', parse_decimal, 'must be a number'),
+        'gdp_max': ('estimated_gdp__lte', parse_decimal, 'must be a number'),
+    }
+
+    def list(self, request, *args, **kwargs):
+        params = sorted(request.query_params.lists())
+        data = get_or_compute(
+            make_key('list', params),
+            lambda: self.get_serializer(self.get_queryset(), many=True).data
+        )
+        return Response(data)
+
     def get_queryset(self):
         queryset = Country.objects.all()
 
-        # Filter by region
+        # Filter by region (LOWER(region) matches the composite indexes)
         region = self.request.query_params.get('region', None)
         if region:
-            queryset = queryset.filter(region__iexact=region)
+            queryset = queryset.alias(region_lower=Lower('region')).filter(region_lower=region.lower())
 
         # Filter by currency
         currency = self.request.query_params.get('currency', None)
         if currency:
             queryset = queryset.filter(currency_code__iexact=currency)
 
+        # Range filters on population and GDP
+        errors = {}
+        for param, (lookup, parse, message) in self.RANGE_FILTERS.items():
+            value = self.request.query_params.get(param, None)
+            if not value:
+                continue
+            try:
+                queryset = queryset.filter(**{lookup: parse(value)})
+            except (ValueError, InvalidOperation):
+                errors[param] = message
+        if errors:
+            raise serializers.ValidationError(errors)
+
         # Sorting
         sort_param = self.request.query_params.get('sort', None)
         if sort_param:
@@ -90,9 +135,12 @@ class CountryDetailView(APIView):
     """
     def get(self, request, name, *args, **kwargs):
         try:
-            country = Country.objects.get(name__iexact=name)
-            serializer = CountrySerializer(country)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = get_or_compute(
+                # Keyed on the name as given: SQLite's LIKE only folds ASCII case
+                make_key('detail', name),
+                lambda: CountrySerializer(Country.objects.get(name__iexact=name)).data
+            )
+            return Response(data, status=status.HTTP_200_OK)
         except Country.DoesNotExist:
             return Response({'error': 'Country not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -111,6 +159,11 @@ class StatusView(APIView):
     Show total countries and last refresh timestamp
     """
     def get(self, request):
+        data = get_or_compute(make_key('status'), self.build_status)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def build_status():
         total_countries = Country.objects.count()
         refresh_status = RefreshStatus.objects.first()
         
@@ -125,7 +178,7 @@ class StatusView(APIView):
         }
 
         serializer = StatusResponseSerializer(data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return serializer.data
 
 
 class CountryImageView(APIView):
@@ -136,4 +136,30 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CACHE_DIR = os.path.join(BASE_DIR, 'cache')
 
 # Create cache directory if it doesn't exist
-os.makedirs(CACHE_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# File-based so all workers on the host share one cache without an external
+# service. Keys are namespaced by a data generation (see countries/caching.py).
+# The generation token lives in its own 'generation' cache: culling in
+# 'default' deletes random entries once MAX_ENTRIES is reached, and losing
+# the token there would silently drop the whole cache. The 'generation'
+# cache only ever holds that one key, so it never reaches its limit.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'django'),
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    'generation': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'django-generation'),
+        'TIMEOUT': None,
+    },
+}